@@ -1,13 +1,26 @@
 # Import Libraries
 import streamlit as st
 from openai import OpenAI
-from dotenv import load_dotenv
 import os
-import base64
+import concurrent.futures
+import re
+import threading
+from collections import deque
+import hashlib
+import time
+import httpx
+import numpy as np
+from io import BytesIO
 from typing import List, Dict, Any
 
-# load environment variables
-load_dotenv()
+# Load environment variables; skipped when the key is already set (e.g. in
+# production) so the dotenv import and .env scan stay off the cold-start path.
+# PIL, pybase64 and orjson are imported inside the functions that use them
+# for the same reason.
+if not os.getenv("OPENAI_API_KEY"):
+    from dotenv import load_dotenv
+
+    load_dotenv()
 
 # App configurations
 st.set_page_config(
@@ -62,8 +75,34 @@ VECTOR_STORE_ID = os.getenv("VECTOR_STORE_ID") or st.secrets["VECTOR_STORE_ID"]
 # Set OpenAI API key in environment
 os.environ["OPENAI_API_KEY"] = OPENAI_API_KEY
 
-# Initialize the OpenAI client
-client = OpenAI()
+
+# Initialize the OpenAI client once and reuse it across reruns and sessions,
+# so the underlying httpx connection pool (and its TCP+TLS handshakes) is not
+# torn down and rebuilt on every script rerun. HTTP/2 lets concurrent
+# embedding and response calls share one connection.
+@st.cache_resource
+def get_client() -> OpenAI:
+    """
+    Return the shared OpenAI client backed by a persistent HTTP/2 pool.
+    """
+    return OpenAI(
+        http_client=httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    )
+
+
+client = get_client()
+
+
+# Shared executor for speculative background API calls
+@st.cache_resource
+def get_background_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Return the shared executor used to precompute spare response candidates.
+    """
+    return concurrent.futures.ThreadPoolExecutor(max_workers=2)
 
 
 # Warn if OpenAI API Key or the vector store id are not set:
@@ -98,28 +137,51 @@ Use the retrieved documents to support your recommendations with current industr
 Be encouraging, professional, and focus on practical steps the user can take to advance their career.
 """
 
+# Shorter system prompt for chit-chat turns that skip retrieval entirely
+CHITCHAT_SYSTEM_PROMPT = """
+You are a friendly AI Career Software Advisor. Respond briefly and warmly to greetings and small talk,
+and invite the user to ask about their software development career.
+"""
+
+# Queries matching none of these terms are treated as chit-chat ("hi",
+# "thanks") and skip the file_search tool, avoiding a server-side vector
+# search and the longer system-prompt prefill
+NEEDS_RAG_RE = re.compile(
+    r"(job|salary|resume|cv|portfolio|interview|skill|stack|framework|career"
+    r"|role|learn|study|language|engineer|developer|tech|code|coding)",
+    re.I,
+)
+
+# Markdown code fence wrapper around a structured reply; compiled once at
+# module scope so the bulk parser never recompiles it per call
+CODE_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+# Only this many messages are kept for display (the deque holding the chat
+# history drops the oldest automatically); the model still sees the full
+# conversation server-side via previous_response_id chaining
+MAX_DISPLAY_MESSAGES = 40
+
 # Store the previous response id
 if "previous_response_id" not in st.session_state:
     st.session_state.previous_response_id = None
 
-# Initialize the chat history
+# Initialize the chat history as a bounded deque: appends are O(1) and old
+# messages fall off the display window automatically
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = deque(maxlen=MAX_DISPLAY_MESSAGES)
 
 if "thread_id" not in st.session_state:
     st.session_state.thread_id = None
 
+# Speculative spare candidate for "Regenerate": a Future holding a second
+# response generated in the background right after each answer
+if "spare_response" not in st.session_state:
+    st.session_state.spare_response = None
 
-# Create a sidebar with user controls
-with st.sidebar:
-    st.header("User Controls")
-    st.divider()
-    # Clear the conversation history - reset chat history and context
-    if st.button("Clear Conversation History", use_container_width=True):
-        st.session_state.messages = []
-        st.session_state.previous_response_id = None
-        # reset the page
-        st.rerun()
+# The (parts, previous_response_id, needs_rag) that produced the last
+# answer, kept so a regenerate can replay the same request
+if "last_request" not in st.session_state:
+    st.session_state.last_request = None
 
 
 # Helper functions
@@ -156,6 +218,7 @@ def build_input_parts(text: str, images: List[Dict[str, Any]]) -> List[Dict[str,
 def call_responses_api(
     parts: List[Dict[str, Any]],
     previous_response_id: str | None = None,
+    use_rag: bool = True,
 ) -> Any:
     """
     Call the OpenAI responses API to generate a response based on the provided messages and system prompt.
@@ -163,6 +226,8 @@ def call_responses_api(
     Args:
         parts (List[Dict[str, Any]]): The input parts for the response.
         previous_response_id (str, optional): The ID of the previous response for context. Defaults to None.
+        use_rag (bool, optional): Whether to attach the file_search tool and
+            full system prompt; chit-chat turns pass False. Defaults to True.
 
     Returns:
         Dict[str, Any]: The response from the OpenAI API.
@@ -170,13 +235,17 @@ def call_responses_api(
     response = client.responses.create(
         model="gpt-5-nano",
         input=parts,
-        tools=[
-            {
-                "type": "file_search",
-                "vector_store_ids": [VECTOR_STORE_ID],
-            }
-        ],
-        instructions=SYSTEM_PROMPT,
+        tools=(
+            [
+                {
+                    "type": "file_search",
+                    "vector_store_ids": [VECTOR_STORE_ID],
+                }
+            ]
+            if use_rag
+            else []
+        ),
+        instructions=SYSTEM_PROMPT if use_rag else CHITCHAT_SYSTEM_PROMPT,
         previous_response_id=previous_response_id,
     )
     return response
@@ -190,88 +259,723 @@ def get_text_output(response: Any) -> str:
     return response.output_text
 
 
-# Initialize uploader key for resetting
-if "uploader_key" not in st.session_state:
-    st.session_state.uploader_key = 0
+# Streaming UI throttle: flush buffered deltas at most every 50 ms (or once
+# 8 characters have accumulated) so Streamlit is not asked to rerender the
+# app for every single token
+STREAM_FLUSH_SECONDS = 0.05
+STREAM_FLUSH_CHARS = 8
 
-# User interface - upload images
-uploaded = st.file_uploader(
-    "Upload images",
-    type=["jpg", "jpeg", "png", "webp"],
-    accept_multiple_files=True,
-    key=f"uploader_{st.session_state.uploader_key}",
-)
 
-# Display the chat history
-for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
-        if message["role"] == "user":
-            # Display user message text only
-            st.markdown(message["content"]["text"])
-            # Display images if they were part of this message
-            if "images" in message["content"] and message["content"]["images"]:
-                for img_url in message["content"]["images"]:
-                    st.image(img_url, width=300)
-        else:
-            # Display assistant response
-            st.markdown(message["content"])
-
-# Add a chat input widget
-chat_input = st.chat_input("Ask me anything about getting a Software Engineering job!")
-
-if chat_input is not None:
-    # Process the images into an API-compatible format
-    images = [
-        {
-            "mime_type": f"image/{f.type.split('/')[-1]}" if f.type else "image/png",
-            "data_url": f"data:{f.type};base64,{base64.b64encode(f.read()).decode('utf-8')}",
-        }
-        for f in (uploaded or [])
-    ]
-
-    # Build the input parts for the responses API
-    parts = build_input_parts(chat_input, images)
-
-    # Store image URLs for display in chat history
-    image_urls = [img["data_url"] for img in images] if images else []
-
-    # Store the user message with text and images
-    st.session_state.messages.append(
-        {"role": "user", "content": {"text": chat_input, "images": image_urls}}
+# Function to stream a response from the OpenAI responses API
+def stream_response_text(
+    parts: List[Dict[str, Any]],
+    previous_response_id: str | None,
+    final: Dict[str, Any],
+    use_rag: bool = True,
+):
+    """
+    Stream the response text token-by-token instead of blocking until the
+    full answer is generated, so the first tokens appear almost immediately.
+    Deltas are batched in a local buffer and flushed at ~20 Hz to keep the
+    per-token rerender cost down.
+
+    Args:
+        parts (List[Dict[str, Any]]): The input parts for the response.
+        previous_response_id (str, optional): The ID of the previous response
+            for context.
+        final (Dict[str, Any]): A holder dict; the completed response object
+            is stored under "response" once the stream finishes.
+        use_rag (bool, optional): Whether to attach the file_search tool and
+            full system prompt; chit-chat turns pass False. Defaults to True.
+
+    Yields:
+        str: Buffered text deltas as they arrive from the API.
+    """
+    buffer = ""
+    last_flush = time.monotonic()
+    with client.responses.stream(
+        model="gpt-5-nano",
+        input=parts,
+        tools=(
+            [
+                {
+                    "type": "file_search",
+                    "vector_store_ids": [VECTOR_STORE_ID],
+                }
+            ]
+            if use_rag
+            else []
+        ),
+        instructions=SYSTEM_PROMPT if use_rag else CHITCHAT_SYSTEM_PROMPT,
+        previous_response_id=previous_response_id,
+    ) as stream:
+        for event in stream:
+            if event.type == "response.output_text.delta":
+                buffer += event.delta
+                now = time.monotonic()
+                if (
+                    now - last_flush >= STREAM_FLUSH_SECONDS
+                    or len(buffer) >= STREAM_FLUSH_CHARS
+                ):
+                    yield buffer
+                    buffer = ""
+                    last_flush = now
+        # Always flush whatever is left once the stream completes
+        if buffer:
+            yield buffer
+        final["response"] = stream.get_final_response()
+
+
+# Exact-match response cache for text-only questions asked at the start of a
+# conversation. Repeated FAQs skip the API round trip entirely and return the
+# stored answer in microseconds. Shared across reruns and sessions; populated
+# manually after a streamed response completes.
+EXACT_CACHE_MAX_ENTRIES = 512
+
+# Cached responses (exact and semantic) expire after an hour: besides staying
+# reasonably fresh, their response ids are reused as previous_response_id, so
+# an entry must never outlive the id's validity on OpenAI's side
+RESPONSE_CACHE_TTL_SECONDS = 3600
+
+
+@st.cache_resource
+def get_exact_cache() -> Dict[str, tuple]:
+    """
+    Return the shared exact-match cache, mapping sha256(query) to
+    (response text, response id, storage time).
+    """
+    return {}
+
+
+# The exact-match cache is shared across session threads, so its
+# read-modify-write accesses serialize on this lock
+@st.cache_resource
+def get_exact_cache_lock() -> threading.Lock:
+    """
+    Return the lock guarding the shared exact-match cache.
+    """
+    return threading.Lock()
+
+
+# Function to parse the structured reply of a bulk-questions call
+def parse_bulk_answers(text: str, expected: int) -> List[str] | None:
+    """
+    Parse the model's bulk reply into one answer per question.
+
+    Args:
+        text (str): The raw response text, expected to be a JSON array of
+            strings (possibly wrapped in a markdown code fence).
+        expected (int): How many answers the array must contain.
+
+    Returns:
+        List[str] | None: The answers, or None if the reply did not follow
+        the requested format.
+    """
+    import orjson
+
+    cleaned = CODE_FENCE_RE.sub("", text.strip())
+    try:
+        answers = orjson.loads(cleaned)
+    except ValueError:
+        return None
+    if isinstance(answers, list) and len(answers) == expected:
+        return [str(answer) for answer in answers]
+    return None
+
+
+# Function to answer several questions with a single API call
+def answer_bulk_questions(
+    questions: List[str],
+    previous_response_id: str | None = None,
+) -> tuple[List[str] | None, str, str | None]:
+    """
+    Answer a batch of questions in one Responses API call, so the system
+    prompt prefill and the network round trip are paid once instead of once
+    per question.
+
+    Args:
+        questions (List[str]): The questions to answer.
+        previous_response_id (str, optional): The response id to chain from,
+            so the call reuses the warmed prompt prefix. Defaults to None.
+
+    Returns:
+        tuple: (per-question answers or None if the model ignored the format,
+        the raw response text, the response id).
+    """
+    numbered = "\n".join(f"{i + 1}. {q}" for i, q in enumerate(questions))
+    prompt = (
+        "Answer each of the following numbered questions independently. "
+        "Return ONLY a JSON array of strings, where element i is the full "
+        "answer to question i+1, with no surrounding commentary.\n\n"
+        f"{numbered}"
     )
+    response = call_responses_api(
+        build_input_parts(prompt, []),
+        previous_response_id,
+    )
+    text = get_text_output(response)
+    return parse_bulk_answers(text, len(questions)), text, response.id
+
+
+# Warm the server-side prompt prefix once per process: a hidden call carrying
+# just the system prompt and tool schema leaves OpenAI's prefix KV cache hot,
+# so the first real turn of every session skips that part of the prefill.
+@st.cache_resource
+def get_warm_response_id() -> str | None:
+    """
+    Issue a single warm-up call and return its response id, used to seed
+    previous_response_id for new sessions. Returns None if the warm-up
+    fails (e.g. missing credentials) so sessions fall back to a cold start.
+    """
+    try:
+        warm = call_responses_api(build_input_parts("ready", []))
+        return warm.id
+    except Exception:
+        return None
+
 
-    # Display the user's message
-    with st.chat_message("user"):
-        st.markdown(chat_input)
-        # Display uploaded images if any
-        for image in images:
-            st.image(image["data_url"], width=300)
+def exact_cache_key(chat_input: str) -> str:
+    """Hash a query into its exact-match cache key."""
+    return hashlib.sha256(chat_input.encode("utf-8")).hexdigest()
 
-    # Generate the AI response
-    with st.chat_message("assistant"):
-        with st.spinner("...thinking..."):
+
+def exact_cache_lookup(key: str) -> tuple | None:
+    """
+    Return the (response text, response id) stored under a query hash, or
+    None on a miss. Entries past the TTL are dropped on lookup.
+    """
+    with get_exact_cache_lock():
+        cache = get_exact_cache()
+        entry = cache.get(key)
+        if entry is None:
+            return None
+        text, response_id, stored_at = entry
+        if time.time() - stored_at > RESPONSE_CACHE_TTL_SECONDS:
+            cache.pop(key, None)
+            return None
+        return text, response_id
+
+
+def exact_cache_store(key: str, text: str, response_id: str | None) -> None:
+    """
+    Store a response under its query hash with its storage time, evicting
+    the oldest entry (dicts iterate in insertion order) once the cache is
+    full.
+    """
+    with get_exact_cache_lock():
+        cache = get_exact_cache()
+        if len(cache) >= EXACT_CACHE_MAX_ENTRIES:
+            cache.pop(next(iter(cache)))
+        cache[key] = (text, response_id, time.time())
+
+
+# Semantic cache configuration
+SEMANTIC_CACHE_THRESHOLD = 0.93
+SEMANTIC_CACHE_MAX_ENTRIES = 1024
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIM = 1536
+LSH_NUM_BITS = 16
+
+
+class LSHCache:
+    """
+    Semantic cache indexed with random-projection LSH.
+
+    Each embedding is hashed into LSH_NUM_BITS sign bits of a fixed random
+    projection and bucketed by that hash, so lookups only compute cosine
+    similarity against the query's bucket (plus its Hamming-distance-1
+    neighbors) instead of scanning every cached entry. Entries live in a
+    fixed-size ring buffer, so eviction is FIFO once the cache is full.
+
+    The instance is shared across Streamlit sessions (and therefore
+    threads), so get and put serialize on an internal lock.
+    """
+
+    def __init__(
+        self,
+        num_bits: int = LSH_NUM_BITS,
+        dim: int = EMBEDDING_DIM,
+        max_entries: int = SEMANTIC_CACHE_MAX_ENTRIES,
+    ) -> None:
+        self.max_entries = max_entries
+        self.num_bits = num_bits
+        self._projection = np.random.randn(num_bits, dim).astype(np.float32)
+        self._bit_weights = 1 << np.arange(num_bits)
+        # entries[i] = (vector, response text, response id, bucket hash,
+        # storage time)
+        self.entries: List[tuple] = []
+        self.buckets: Dict[int, List[int]] = {}
+        self._next_slot = 0
+        self._lock = threading.Lock()
+
+    def _hash(self, vec: np.ndarray) -> int:
+        """Hash a vector into an integer bucket key via projection signs."""
+        return int((self._projection @ vec > 0) @ self._bit_weights)
+
+    def get(self, query_vec: np.ndarray) -> tuple[str, str] | None:
+        """
+        Return (response text, response id) of the closest cached entry in
+        the query's bucket neighborhood if it meets the similarity
+        threshold, otherwise None. Entries past the response TTL are
+        ignored so stale response ids are never handed back out.
+        """
+        bucket_hash = self._hash(query_vec)
+        oldest_valid = time.time() - RESPONSE_CACHE_TTL_SECONDS
+        with self._lock:
+            candidates = list(self.buckets.get(bucket_hash, []))
+            for bit in range(self.num_bits):
+                candidates.extend(self.buckets.get(bucket_hash ^ (1 << bit), []))
+            best_sim = -1.0
+            best_entry = None
+            for index in candidates:
+                entry = self.entries[index]
+                if entry[4] < oldest_valid:
+                    continue
+                sim = float(entry[0] @ query_vec)
+                if sim > best_sim:
+                    best_sim = sim
+                    best_entry = entry
+            if best_entry is not None and best_sim >= SEMANTIC_CACHE_THRESHOLD:
+                return best_entry[1], best_entry[2]
+            return None
+
+    def put(self, query_vec: np.ndarray, text: str, response_id: str | None) -> None:
+        """Insert an entry, overwriting the oldest slot once full."""
+        bucket_hash = self._hash(query_vec)
+        entry = (query_vec, text, response_id, bucket_hash, time.time())
+        with self._lock:
+            slot = self._next_slot
+            if len(self.entries) < self.max_entries:
+                self.entries.append(entry)
+            else:
+                old_hash = self.entries[slot][3]
+                self.buckets[old_hash].remove(slot)
+                self.entries[slot] = entry
+            self.buckets.setdefault(bucket_hash, []).append(slot)
+            self._next_slot = (slot + 1) % self.max_entries
+
+
+# Semantic cache shared across sessions: near-duplicate questions ("faang
+# interview prep tips" vs "how do I prep for a FAANG interview") are answered
+# with a single cheap embedding call instead of a full GPT-5 + RAG round trip.
+@st.cache_resource
+def get_semantic_cache() -> LSHCache:
+    """
+    Return the shared LSH-indexed semantic cache.
+    """
+    return LSHCache()
+
+
+def embed_query(text: str) -> np.ndarray:
+    """
+    Embed a query with the embedding model and L2-normalize the vector.
+
+    Args:
+        text (str): The query text to embed.
+
+    Returns:
+        np.ndarray: The normalized embedding vector.
+    """
+    result = client.embeddings.create(model=EMBEDDING_MODEL, input=text)
+    vec = np.asarray(result.data[0].embedding, dtype=np.float32)
+    return vec / np.linalg.norm(vec)
+
+
+def semantic_lookup(query_vec: np.ndarray) -> tuple[str, str] | None:
+    """
+    Look up a cached response whose query is semantically close enough.
+
+    Args:
+        query_vec (np.ndarray): The normalized embedding of the new query.
+
+    Returns:
+        tuple[str, str] | None: (response text, response id) of the best match
+        if its cosine similarity meets the threshold, otherwise None.
+    """
+    return get_semantic_cache().get(query_vec)
+
+
+def semantic_store(query_vec: np.ndarray, text: str, response_id: str | None) -> None:
+    """
+    Add a (vector, response text, response id) entry to the semantic cache,
+    evicting the oldest entry (FIFO) once the cache is full.
+    """
+    get_semantic_cache().put(query_vec, text, response_id)
+
+
+# Thumbnails stored in the chat history match the st.image display width
+THUMBNAIL_SIZE = (300, 300)
+
+# Uploads at least this large (typically PNG screenshots) are re-encoded to
+# WebP before base64, shrinking the request payload several-fold
+WEBP_MIN_BYTES = 200_000
+WEBP_QUALITY = 85
+
+
+# Function to shrink large uploads before they are base64-encoded. Cached by
+# content digest so the re-encode runs once per upload, not per rerun. The
+# compressed bytes and full-resolution data URLs below are multi-MB each, so
+# those caches hold few entries; thumbnails are tiny and can keep more. All
+# are bounded so unique uploads cannot grow process memory forever.
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=64)
+def compress_image(_raw: bytes, mime: str, digest: str) -> tuple[bytes, str]:
+    """
+    Re-encode a large image as WebP to cut its payload size.
+
+    Args:
+        _raw (bytes): The original image bytes (excluded from the cache key).
+        mime (str): The image's mime type.
+        digest (str): The sha256 hex digest of the image bytes.
+
+    Returns:
+        tuple[bytes, str]: The (possibly re-encoded) bytes and mime type.
+        Small images and images already in WebP are returned unchanged, as
+        are images the re-encode fails to shrink.
+    """
+    from PIL import Image
+
+    if len(_raw) < WEBP_MIN_BYTES or mime == "image/webp":
+        return _raw, mime
+    image = Image.open(BytesIO(_raw))
+    buffer = BytesIO()
+    image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=4)
+    compressed = buffer.getvalue()
+    if len(compressed) >= len(_raw):
+        return _raw, mime
+    return compressed, "image/webp"
+
+
+# Function to build a small thumbnail data URL for the chat history. Cached so
+# re-uploads (and reruns) reuse the downscaled copy instead of re-encoding.
+# The underscore on _raw keeps Streamlit from hashing multi-MB blobs on every
+# rerun; the sha256 digest computed once per upload is the cache key instead.
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=256)
+def make_thumbnail(_raw: bytes, digest: str) -> str:
+    """
+    Downscale an image to a 300 px JPEG thumbnail encoded as a data URL.
+
+    Args:
+        _raw (bytes): The original image bytes (excluded from the cache key).
+        digest (str): The sha256 hex digest of the image bytes.
+
+    Returns:
+        str: A small data URL suitable for storing in the chat history.
+    """
+    import pybase64
+    from PIL import Image
+
+    image = Image.open(BytesIO(_raw))
+    image.thumbnail(THUMBNAIL_SIZE)
+    buffer = BytesIO()
+    image.convert("RGB").save(buffer, "JPEG", quality=80)
+    encoded = pybase64.b64encode(buffer.getvalue()).decode("ascii")
+    return f"data:image/jpeg;base64,{encoded}"
+
+
+# Function to build the full-resolution data URL, cached the same way
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=64)
+def encode_image(_raw: bytes, mime: str, digest: str) -> str:
+    """
+    Encode image bytes as a base64 data URL.
+
+    Args:
+        _raw (bytes): The original image bytes (excluded from the cache key).
+        mime (str): The image's mime type.
+        digest (str): The sha256 hex digest of the image bytes.
+
+    Returns:
+        str: The full-resolution data URL for the API payload.
+    """
+    import pybase64
+
+    return f"data:{mime};base64,{pybase64.b64encode(_raw).decode('ascii')}"
+
+
+# Function to encode a single uploaded image for the responses API
+def encode_uploaded_image(f: Any) -> Dict[str, str]:
+    """
+    Read an uploaded file and encode it as a base64 data URL, along with a
+    small thumbnail for the chat history. The file's sha256 is computed once
+    and used as the dedup key for both cached encodes, so reruns and
+    re-uploads of the same content skip the work entirely.
+
+    Args:
+        f: An uploaded file from st.file_uploader.
+
+    Returns:
+        Dict[str, str]: The image's mime type, content digest, full-resolution
+        data URL for the API payload, and thumbnail data URL for display.
+    """
+    raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    mime = f.type if f.type else "image/png"
+    raw, mime = compress_image(raw, mime, digest)
+    return {
+        "mime_type": f"image/{mime.split('/')[-1]}",
+        "digest": digest,
+        "data_url": encode_image(raw, mime, digest),
+        "thumbnail": make_thumbnail(raw, digest),
+    }
+
+
+# Function to encode all uploaded images concurrently
+def encode_uploaded_images(uploaded_files: List[Any]) -> List[Dict[str, str]]:
+    """
+    Encode uploaded images in parallel so multi-image uploads overlap their
+    reads and base64 encoding instead of blocking the script thread serially.
+
+    Args:
+        uploaded_files (List[Any]): The uploaded files, possibly empty.
+
+    Returns:
+        List[Dict[str, str]]: The encoded images in upload order.
+    """
+    if not uploaded_files:
+        return []
+    workers = min(8, len(uploaded_files))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(encode_uploaded_image, uploaded_files))
+
+
+# Seed fresh conversations with the warmed prefix response id so their first
+# turn chains off the already-cached system prompt
+if st.session_state.previous_response_id is None and not st.session_state.messages:
+    st.session_state.previous_response_id = get_warm_response_id()
+
+# Create a sidebar with user controls
+with st.sidebar:
+    st.header("User Controls")
+    st.divider()
+    # Clear the conversation history - reset chat history and context
+    if st.button("Clear Conversation History", use_container_width=True):
+        st.session_state.messages = deque(maxlen=MAX_DISPLAY_MESSAGES)
+        st.session_state.previous_response_id = None
+        st.session_state.spare_response = None
+        st.session_state.last_request = None
+        # reset the page
+        st.rerun()
+
+    # Regenerate the last answer, served instantly from the precomputed
+    # spare candidate when one is ready
+    if st.button("Regenerate Last Answer", use_container_width=True):
+        if (
+            st.session_state.last_request is not None
+            and st.session_state.messages
+            and st.session_state.messages[-1]["role"] == "assistant"
+        ):
+            spare = st.session_state.spare_response
+            st.session_state.spare_response = None
             try:
-                response = call_responses_api(
-                    parts,
-                    st.session_state.previous_response_id,
+                if spare is not None:
+                    response = spare.result()
+                else:
+                    last_parts, last_previous_id, last_needs_rag = (
+                        st.session_state.last_request
+                    )
+                    response = call_responses_api(
+                        last_parts, last_previous_id, last_needs_rag
+                    )
+                st.session_state.messages[-1] = {
+                    "role": "assistant",
+                    "content": get_text_output(response),
+                }
+                st.session_state.previous_response_id = response.id
+                st.rerun()
+            except Exception as e:
+                st.error(f"An error occurred: {e}")
+
+
+# Bulk questions: several queries answered with a single API call, so the
+# prompt prefill and round trip are shared across all of them
+with st.expander("Bulk questions"):
+    bulk_text = st.text_area(
+        "One question per line",
+        placeholder="What skills do I need for backend roles?\nHow do I prepare for system design interviews?",
+    )
+    if st.button("Answer All", use_container_width=True) and bulk_text.strip():
+        questions = [line.strip() for line in bulk_text.splitlines() if line.strip()]
+        try:
+            answers, raw_text, response_id = answer_bulk_questions(
+                questions,
+                st.session_state.previous_response_id,
+            )
+            if answers is not None:
+                # Record each question/answer pair in the chat history
+                for question, answer in zip(questions, answers):
+                    st.session_state.messages.append(
+                        {"role": "user", "content": {"text": question, "images": []}}
+                    )
+                    st.session_state.messages.append(
+                        {"role": "assistant", "content": answer}
+                    )
+            else:
+                # The model ignored the format; show the combined reply
+                st.session_state.messages.append(
+                    {
+                        "role": "user",
+                        "content": {"text": "\n".join(questions), "images": []},
+                    }
+                )
+                st.session_state.messages.append(
+                    {"role": "assistant", "content": raw_text}
                 )
-                ai_response_text = get_text_output(response)
+            st.session_state.previous_response_id = response_id
+            st.rerun()
+        except Exception as e:
+            st.error(f"An error occurred: {e}")
 
-                # Display the AI response
-                st.markdown(ai_response_text)
+# Initialize uploader key for resetting
+if "uploader_key" not in st.session_state:
+    st.session_state.uploader_key = 0
+
+# Chat UI fragment: only this block reruns on chat interaction, so the
+# title, description markdown, expander and sidebar are not re-executed
+# for every message or stream tick
+@st.fragment
+def render_chat() -> None:
+    """
+    Render the image uploader, chat history, chat input and response
+    handling as a self-contained fragment.
+    """
+    # User interface - upload images
+    uploaded = st.file_uploader(
+        "Upload images",
+        type=["jpg", "jpeg", "png", "webp"],
+        accept_multiple_files=True,
+        key=f"uploader_{st.session_state.uploader_key}",
+    )
+
+    # Display the chat history
+    for message in st.session_state.messages:
+        with st.chat_message(message["role"]):
+            if message["role"] == "user":
+                # Display user message text only
+                st.markdown(message["content"]["text"])
+                # Display images if they were part of this message
+                if "images" in message["content"] and message["content"]["images"]:
+                    for img_url in message["content"]["images"]:
+                        st.image(img_url, width=300)
+            else:
+                # Display assistant response
+                st.markdown(message["content"])
+
+    # Add a chat input widget
+    chat_input = st.chat_input("Ask me anything about getting a Software Engineering job!")
+
+    if chat_input is not None:
+        # A new question invalidates any spare candidate for the previous one
+        if st.session_state.spare_response is not None:
+            st.session_state.spare_response.cancel()
+            st.session_state.spare_response = None
+
+        # The response id this turn chains from (captured before it is updated)
+        previous_id = st.session_state.previous_response_id
+
+        # First turn of a conversation (checked before the user message is
+        # appended); previous_id alone no longer tells, since fresh sessions
+        # start from the warmed prefix response
+        first_turn = not st.session_state.messages
+
+        # Process the images into an API-compatible format
+        images = encode_uploaded_images(uploaded or [])
+
+        # Build the input parts for the responses API
+        parts = build_input_parts(chat_input, images)
+
+        # Image turns (resume screenshots etc.) always get retrieval; pure
+        # chit-chat text skips the vector search
+        needs_rag = bool(images) or bool(NEEDS_RAG_RE.search(chat_input))
+
+        # Store only the small thumbnails in chat history; the full-resolution
+        # data URLs go to the API payload and are dropped after this turn
+        image_urls = [img["thumbnail"] for img in images] if images else []
+
+        # Store the user message with text and images; the deque keeps only
+        # the display window
+        st.session_state.messages.append(
+            {"role": "user", "content": {"text": chat_input, "images": image_urls}}
+        )
+
+        # Display the user's message
+        with st.chat_message("user"):
+            st.markdown(chat_input)
+            # Display uploaded images if any
+            for image in images:
+                st.image(image["thumbnail"], width=300)
+
+        # Generate the AI response
+        with st.chat_message("assistant"):
+            try:
+                # Text-only queries with no history can be served from the
+                # exact-match or semantic cache instead of a fresh API call
+                cacheable = first_turn and not images
+                ai_response_text = None
+                response_id = None
+                query_vec = None
+                cache_key = None
+                if cacheable:
+                    cache_key = exact_cache_key(chat_input)
+                    cached = exact_cache_lookup(cache_key)
+                    if cached is None:
+                        query_vec = embed_query(chat_input)
+                        cached = semantic_lookup(query_vec)
+                    if cached is not None:
+                        ai_response_text, response_id = cached
+                        st.markdown(ai_response_text)
+
+                # Cache miss (or ineligible): stream the response as it arrives
+                if ai_response_text is None:
+                    final: Dict[str, Any] = {}
+                    ai_response_text = st.write_stream(
+                        stream_response_text(
+                            parts,
+                            previous_id,
+                            final,
+                            needs_rag,
+                        )
+                    )
+                    response = final.get("response")
+                    response_id = response.id if response is not None else None
+                    if cacheable:
+                        exact_cache_store(cache_key, ai_response_text, response_id)
+                        if query_vec is not None:
+                            semantic_store(query_vec, ai_response_text, response_id)
+
+                    # Speculatively generate a second candidate in the
+                    # background so a "Regenerate Last Answer" click can be
+                    # served instantly. Only on cache misses: a cached hit
+                    # cost no API call, and firing one here anyway would
+                    # defeat the cache; regenerate falls back to a fresh
+                    # call when no spare exists
+                    st.session_state.spare_response = (
+                        get_background_executor().submit(
+                            call_responses_api, parts, previous_id, needs_rag
+                        )
+                    )
+
+                # Kept for regenerate's fallback path on cached turns too
+                st.session_state.last_request = (parts, previous_id, needs_rag)
 
                 # Retrieve ID if available
                 st.session_state.previous_response_id = (
-                    response.id if response.id else None
+                    response_id if response_id else None
                 )
-                # Store the AI response in the chat history
+                # Store the AI response in the chat history; the deque keeps
+                # only the display window
                 st.session_state.messages.append(
                     {"role": "assistant", "content": ai_response_text}
                 )
 
-                # Clear the file uploader by incrementing the key
+                # Clear the file uploader by incrementing the key; the
+                # uploader, history and chat input all live in this
+                # fragment, so rerun only it (st.rerun defaults to the
+                # whole app even when called inside a fragment)
                 st.session_state.uploader_key += 1
-                st.rerun()
+                st.rerun(scope="fragment")
 
             except Exception as e:
                 st.error(f"An error occurred: {e}")
+
+
+
+render_chat()